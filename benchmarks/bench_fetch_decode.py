@@ -0,0 +1,81 @@
+"""Benchmark: charset resolution + decode of fetched HTML bodies.
+
+Compares whole-body statistical detection (what `requests` does via
+`apparent_encoding` when no usable charset is known) against
+`resolve_encoding` (header -> BOM -> bounded <meta> scan -> detection).
+
+Run:
+    python -m benchmarks.bench_fetch_decode
+"""
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+from requests.compat import chardet
+
+from src.server import _decode_html, extract_main_text, resolve_encoding
+
+_PARAGRAPH = "新製品の発表により、売上高は前年同期比で12.5%増加しました。"
+
+
+def _page(encoding: str, size: int, with_meta: bool) -> bytes:
+    meta = f'<meta charset="{encoding}">' if with_meta else ""
+    head = f"<html><head>{meta}<title>ニュース</title></head><body><article>"
+    paragraphs = []
+    total = len(head)
+    while total < size:
+        p = f"<p>{_PARAGRAPH}</p>"
+        paragraphs.append(p)
+        total += len(p.encode(encoding))
+    return (head + "".join(paragraphs) + "</article></body></html>").encode(
+        encoding
+    )
+
+
+def _detect_full(content: bytes, content_type: Optional[str]) -> str:
+    enc = chardet.detect(content).get("encoding") or "utf-8"
+    return content.decode(enc, errors="replace")
+
+
+def _resolve(content: bytes, content_type: Optional[str]) -> str:
+    return _decode_html(content, resolve_encoding(content, content_type))
+
+
+def _time(fn: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    cases = [
+        ("utf-8", True),
+        ("shift_jis", True),
+        ("euc-jp", True),
+        ("shift_jis", False),
+        ("euc-jp", False),
+    ]
+    print(
+        f"{'encoding':<10} {'meta':<5} {'size':>8} {'detect':>10} "
+        f"{'resolve':>10} {'extract(bytes)':>15}"
+    )
+    for size in (100_000, 1_000_000):
+        for encoding, with_meta in cases:
+            body = _page(encoding, size, with_meta)
+            ct = "text/html"
+            t_detect = _time(lambda: _detect_full(body, ct), repeat=1)
+            t_resolve = _time(lambda: _resolve(body, ct))
+            t_extract = _time(lambda: extract_main_text(body), repeat=1)
+            print(
+                f"{encoding:<10} {str(with_meta):<5} {len(body):>8} "
+                f"{t_detect * 1000:>8.1f}ms {t_resolve * 1000:>8.1f}ms "
+                f"{t_extract * 1000:>13.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: encoding a fetch_url response for the NDJSON stdio server.
+
+Compares the previous path (`model_dump()` -> `json.dumps(...,
+ensure_ascii=False)` -> text stdout) with `dump_json` into a binary buffer,
+reporting wall time and peak traced memory per payload size.
+
+Run:
+    python -m benchmarks.bench_serialization
+"""
+from __future__ import annotations
+
+import io
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Tuple
+
+from src.serialization import dump_json
+from src.server import FetchResult
+
+_CHUNK = "<p>新製品の発表により、売上高は前年同期比で12.5%増加しました。</p>\n"
+
+
+def _result(size: int) -> FetchResult:
+    html = _CHUNK * (size // len(_CHUNK.encode("utf-8")) + 1)
+    return FetchResult.model_construct(
+        final_url="https://example.com/news/1",
+        status_code=200,
+        fetched_at=datetime.now(timezone.utc),
+        content_type="text/html; charset=utf-8",
+        encoding="utf-8",
+        content=html.encode("utf-8"),
+    )
+
+
+def _legacy(result: FetchResult) -> None:
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+    obj: Dict[str, Any] = {
+        "ok": True,
+        "result": result.model_dump(mode="json"),
+    }
+    out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+def _fast(result: FetchResult) -> None:
+    out = io.BytesIO()
+    out.write(dump_json({"ok": True, "result": result}, Dict[str, Any]))
+    out.write(b"\n")
+
+
+def _measure(fn: Callable[[], None], repeat: int = 5) -> Tuple[float, int]:
+    fn()  # warm up (adapter compilation)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    print(
+        f"{'payload':>10} {'legacy':>10} {'fast':>10} "
+        f"{'legacy peak':>12} {'fast peak':>12}"
+    )
+    for size in (100_000, 1_000_000, 5_000_000):
+        result = _result(size)
+        t_old, m_old = _measure(lambda: _legacy(result))
+        t_new, m_new = _measure(lambda: _fast(result))
+        print(
+            f"{size:>10} {t_old * 1000:>8.2f}ms {t_new * 1000:>8.2f}ms "
+            f"{m_old / 1e6:>10.1f}MB {m_new / 1e6:>10.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,18 @@ class HttpConfig:
     timeout_seconds: int = 10
     max_content_length: int = 5_000_000
     allow_domains: Optional[List[str]] = None
+    # Retries apply to idempotent GETs on transport errors and 429/5xx.
+    max_retries: int = 2
+    retry_backoff_seconds: float = 0.5
+    retry_backoff_max_seconds: float = 5.0
+    # Total time a fetch may spend across retries; None = timeout_seconds.
+    retry_budget_seconds: Optional[float] = None
+    # Hedging fires a second attempt after the host's p95 latency
+    # (hedge_delay_seconds until enough samples are collected).
+    hedge_requests: bool = False
+    hedge_delay_seconds: float = 1.0
+    circuit_failure_threshold: int = 5
+    circuit_reset_seconds: float = 30.0
 
 
 @dataclass
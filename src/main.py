@@ -18,6 +18,10 @@ import sys
 from typing import Any, Dict
 
 from .config import load_config
+from .monitor import extract_main_text_incremental
+from .report import add_report_sources, open_report, write_report_section
+from .resilience import get_circuit_breaker_states
+from .serialization import dump_json
 from .server import (
     SourceRecord,
     extract_evidence_quotes,
@@ -29,7 +33,16 @@ from .server import (
 
 
 def _print(obj: Dict[str, Any]) -> None:
-    sys.stdout.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    # Results may hold pydantic models; they are encoded directly to UTF-8
+    # bytes and written to the binary buffer, without intermediate str copies.
+    payload = dump_json(obj, Dict[str, Any])
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(payload.decode("utf-8") + "\n")
+    else:
+        sys.stdout.flush()
+        out.write(payload)
+        out.write(b"\n")
     sys.stdout.flush()
 
 
@@ -37,18 +50,24 @@ def _handle_invoke(tool: str, params: Dict[str, Any]) -> Any:
     cfg = load_config()
     if tool == "fetch_url":
         url = params.get("url")
-        return fetch_url(url, cfg).model_dump()
+        return fetch_url(url, cfg)
     if tool == "extract_main_text":
         html = params.get("html")
         base_url = params.get("base_url")
-        return extract_main_text(html, base_url).model_dump()
+        return extract_main_text(html, base_url)
+    if tool == "extract_main_text_incremental":
+        return extract_main_text_incremental(
+            params.get("html"),
+            page_key=params.get("page_key"),
+            base_url=params.get("base_url"),
+            include_merged_text=params.get("include_merged_text", True),
+        )
     if tool == "extract_evidence_quotes":
         text = params.get("text")
         claims = params.get("claims", [])
         max_chars = cfg.excerpts.max_chars
         position = cfg.excerpts.default_position
-        result = extract_evidence_quotes(text, claims, max_chars, position)
-        return [r.model_dump() for r in result]
+        return extract_evidence_quotes(text, claims, max_chars, position)
     if tool == "save_sources":
         records_raw = params.get("records", [])
         output_path = params.get("output_path")
@@ -58,6 +77,21 @@ def _handle_invoke(tool: str, params: Dict[str, Any]) -> Any:
         markdown_text = params.get("markdown_text")
         output_path = params.get("output_path")
         return {"path": save_report(markdown_text, output_path)}
+    if tool == "open_report":
+        return open_report(params.get("output_path"), params.get("title"))
+    if tool == "add_report_sources":
+        sources_raw = params.get("sources", {})
+        sources = {k: SourceRecord(**v) for k, v in sources_raw.items()}
+        return add_report_sources(params.get("output_path"), sources)
+    if tool == "write_report_section":
+        return write_report_section(
+            params.get("output_path"),
+            params.get("name"),
+            params.get("markdown_text"),
+            params.get("citations"),
+        )
+    if tool == "get_circuit_breaker_states":
+        return {"hosts": get_circuit_breaker_states()}
     raise ValueError(f"Unknown tool: {tool}")
 
 
@@ -65,9 +99,14 @@ def main() -> None:
     tools = [
         "fetch_url",
         "extract_main_text",
+        "extract_main_text_incremental",
         "extract_evidence_quotes",
         "save_sources",
         "save_report",
+        "open_report",
+        "add_report_sources",
+        "write_report_section",
+        "get_circuit_breaker_states",
     ]
 
     for line in sys.stdin:
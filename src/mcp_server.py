@@ -16,7 +16,20 @@ from typing import Any
 from mcp.server.fastmcp import FastMCP
 
 from .config import load_config
+from .monitor import (
+    extract_main_text_incremental as _extract_main_text_incremental,
+)
+from .report import (
+    add_report_sources as _add_report_sources,
+    open_report as _open_report,
+    write_report_section as _write_report_section,
+)
+from .resilience import (
+    get_circuit_breaker_states as _get_circuit_breaker_states,
+)
+from .serialization import to_jsonable
 from .server import (
+    EvidenceExcerpt,
     SourceRecord,
     extract_evidence_quotes as _extract_evidence_quotes,
     extract_main_text as _extract_main_text,
@@ -30,7 +43,8 @@ mcp = FastMCP(
     json_response=True,
     instructions=(
         "Tools for market/industry analysis: fetch URL HTML, extract main text, "
-        "extract short evidence excerpts (<=500 chars), and save sources/reports."
+        "extract short evidence excerpts (<=500 chars), and save sources/reports "
+        "(whole, or section by section via open_report/write_report_section)."
     ),
 )
 
@@ -48,6 +62,22 @@ def extract_main_text(html: str, base_url: str | None = None) -> dict[str, Any]:
     return _extract_main_text(html, base_url).model_dump(mode="json")
 
 
+@mcp.tool()
+def extract_main_text_incremental(
+    html: str,
+    page_key: str | None = None,
+    base_url: str | None = None,
+    include_merged_text: bool = True,
+) -> dict[str, Any]:
+    """Re-extract only blocks changed since the last poll of a monitored page."""
+    return _extract_main_text_incremental(
+        html,
+        page_key=page_key,
+        base_url=base_url,
+        include_merged_text=include_merged_text,
+    ).model_dump(mode="json")
+
+
 @mcp.tool()
 def extract_evidence_quotes(
     text: str,
@@ -61,7 +91,7 @@ def extract_evidence_quotes(
         max_chars=cfg.excerpts.max_chars,
         default_position=cfg.excerpts.default_position,
     )
-    return [r.model_dump(mode="json") for r in out]
+    return to_jsonable(out, list[EvidenceExcerpt])
 
 
 @mcp.tool()
@@ -77,6 +107,40 @@ def save_report(markdown_text: str, output_path: str) -> dict[str, str]:
     return {"path": _save_report(markdown_text, output_path)}
 
 
+@mcp.tool()
+def open_report(output_path: str, title: str | None = None) -> dict[str, Any]:
+    """Open (or resume) a report session built from named sections."""
+    return _open_report(output_path, title).model_dump(mode="json")
+
+
+@mcp.tool()
+def add_report_sources(
+    output_path: str, sources: dict[str, dict[str, Any]]
+) -> dict[str, Any]:
+    """Store source records (by ID) that report sections can cite."""
+    parsed = {k: SourceRecord(**v) for k, v in sources.items()}
+    return _add_report_sources(output_path, parsed).model_dump(mode="json")
+
+
+@mcp.tool()
+def write_report_section(
+    output_path: str,
+    name: str,
+    markdown_text: str,
+    citations: list[str] | None = None,
+) -> dict[str, Any]:
+    """Append or replace one named section of an opened report."""
+    return _write_report_section(
+        output_path, name, markdown_text, citations
+    ).model_dump(mode="json")
+
+
+@mcp.tool()
+def get_circuit_breaker_states() -> dict[str, Any]:
+    """Per-host fetch circuit breaker state (closed/open/half_open)."""
+    return {"hosts": _get_circuit_breaker_states()}
+
+
 def main() -> None:
     # Default transport for FastMCP is stdio.
     mcp.run()
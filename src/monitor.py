@@ -0,0 +1,423 @@
+"""
+Incremental (block-level) re-extraction for pages polled repeatedly, such as
+keynote liveblogs and newsroom index pages.
+
+On the first poll of a page, readability (the same scorer used by
+`extract_main_text`) picks the main content container; its location is
+remembered so later polls skip readability and look only inside it, as long
+as the re-found container still holds most of the previous blocks. Each
+poll splits the container into blocks: leaf block elements (p, li, h1-h6,
+...) plus anonymous blocks for bare text that sits between them. Each block
+is fingerprinted, and only blocks whose fingerprint was not seen on the
+previous poll of the same page have their text extracted; the rest reuse
+the stored text.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from lxml import etree
+from lxml import html as lxml_html
+from pydantic import BaseModel
+from readability import Document
+
+from .server import ExtractResult, _decode_html, resolve_encoding
+
+# Pages whose previous extraction is kept (least recently polled evicted).
+_MAX_MONITORED_PAGES = 256
+
+_BLOCK_TAGS = frozenset(
+    "p h1 h2 h3 h4 h5 h6 li dt dd blockquote pre figcaption td th caption "
+    "div section article table ul ol dl".split()
+)
+# Page chrome and non-content elements, dropped before block discovery.
+_DROP_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "iframe",
+    "svg",
+    "nav",
+    "header",
+    "footer",
+    "aside",
+    # Form controls only: ASP.NET WebForms pages wrap the whole body in a
+    # <form>, so the form element itself must stay.
+    "input",
+    "select",
+    "button",
+    "textarea",
+)
+# Share of the previous poll's blocks that must still be present under a
+# re-found container before it is trusted (otherwise readability re-runs).
+_MIN_CONTAINER_OVERLAP = 0.5
+
+
+class IncrementalExtractResult(BaseModel):
+    page_key: str
+    initial: bool
+    # `main_text` holds only the new/changed blocks of this poll.
+    delta: ExtractResult
+    merged_text: Optional[str] = None
+    total_blocks: int
+    changed_blocks: int
+    removed_blocks: int
+
+
+@dataclass
+class _PageState:
+    # fingerprint -> extracted block text
+    blocks: Dict[str, str] = field(default_factory=dict)
+    # XPath (id / tag+class chain) of the content container.
+    container: Optional[str] = None
+
+
+@dataclass
+class _Block:
+    fingerprint: str
+    # Element blocks are extracted lazily (only when the fingerprint is new);
+    # anonymous blocks already carry their text.
+    el: Optional[etree._Element] = None
+    text: Optional[str] = None
+
+
+class _PageStore:
+    def __init__(self, max_pages: int) -> None:
+        self._lock = threading.Lock()
+        self._max_pages = max_pages
+        self._pages: "OrderedDict[str, _PageState]" = OrderedDict()
+
+    def get(self, page_key: str) -> Optional[_PageState]:
+        with self._lock:
+            st = self._pages.get(page_key)
+            if st is not None:
+                self._pages.move_to_end(page_key)
+            return st
+
+    def put(self, page_key: str, state: _PageState) -> None:
+        with self._lock:
+            self._pages[page_key] = state
+            self._pages.move_to_end(page_key)
+            while len(self._pages) > self._max_pages:
+                self._pages.popitem(last=False)
+
+    def reset(self, page_key: Optional[str] = None) -> None:
+        with self._lock:
+            if page_key is None:
+                self._pages.clear()
+            else:
+                self._pages.pop(page_key, None)
+
+
+PAGE_STORE = _PageStore(_MAX_MONITORED_PAGES)
+
+
+def reset_page_monitor(page_key: Optional[str] = None) -> None:
+    """Forget stored extractions (one page, or all when page_key is None)."""
+    PAGE_STORE.reset(page_key)
+
+
+def _normalize(raw: str) -> str:
+    lines = (" ".join(line.split()) for line in raw.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _inline_parts(el: etree._Element, parts: List[str]) -> None:
+    """Append the text of `el` (without its tail); <br> becomes a newline."""
+    if el.tag == "br":
+        parts.append("\n")
+        return
+    parts.append(el.text or "")
+    for child in el:
+        if isinstance(child.tag, str):
+            _inline_parts(child, parts)
+        parts.append(child.tail or "")
+
+
+def _block_text(el: etree._Element) -> str:
+    parts: List[str] = []
+    _inline_parts(el, parts)
+    return _normalize("".join(parts))
+
+
+def _element_block(el: etree._Element) -> _Block:
+    raw = etree.tostring(el, with_tail=False)
+    return _Block(hashlib.blake2b(raw, digest_size=12).hexdigest(), el=el)
+
+
+def _anonymous_block(
+    parent: etree._Element, index: int, text: str
+) -> _Block:
+    # Bare text has no markup of its own: fingerprint it by its content and
+    # its position (parent tag, run index within the parent).
+    key = f"{parent.tag}\x00{index}\x00{text}".encode("utf-8")
+    fp = hashlib.blake2b(key, digest_size=12).hexdigest()
+    return _Block(fp, text=text)
+
+
+def _walk(el: etree._Element) -> Optional[List[_Block]]:
+    """Blocks under `el` in document order, or None if it has no block.
+
+    A block element without block descendants is one block. When an element
+    contains blocks, the inline content between them (its own text, inline
+    children and the tails of children) becomes anonymous blocks, so no text
+    is lost.
+    """
+    results = [
+        (child, _walk(child) if isinstance(child.tag, str) else None)
+        for child in el
+    ]
+    if all(res is None for _, res in results):
+        return [_element_block(el)] if el.tag in _BLOCK_TAGS else None
+
+    blocks: List[_Block] = []
+    run: List[str] = [el.text or ""]
+    runs = 0
+
+    def flush() -> None:
+        nonlocal runs
+        text = _normalize("".join(run))
+        if text:
+            blocks.append(_anonymous_block(el, runs, text))
+            runs += 1
+
+    for child, res in results:
+        if res is None:
+            if isinstance(child.tag, str):
+                _inline_parts(child, run)
+            run.append(child.tail or "")
+            continue
+        flush()
+        blocks.extend(res)
+        run = [child.tail or ""]
+    flush()
+    return blocks
+
+
+def _collect_blocks(container: etree._Element) -> List[_Block]:
+    blocks = _walk(container)
+    if blocks is None:
+        # Only inline content (e.g. "<body>text<br>more</body>").
+        return [_element_block(container)]
+    return blocks
+
+
+def _locator(el: etree._Element) -> str:
+    """XPath for `el` that survives inserted siblings.
+
+    Walks up to the nearest ancestor with a unique id and describes the rest
+    as a tag + class chain, without positional indexes. It may match several
+    elements; `_refind_container` picks among them.
+    """
+    tree = el.getroottree()
+    steps: List[str] = []
+    anchor = ""
+    node: Optional[etree._Element] = el
+    while node is not None:
+        node_id = node.get("id")
+        if node_id and "'" not in node_id:
+            xpath = f"//*[@id='{node_id}']"
+            if len(tree.xpath(xpath)) == 1:
+                anchor = xpath
+                break
+        cls = node.get("class")
+        if cls and "'" not in cls:
+            steps.append(f"{node.tag}[@class='{cls}']")
+        else:
+            steps.append(node.tag)
+        node = node.getparent()
+    if not steps:
+        return anchor
+    return anchor + "/" + "/".join(reversed(steps))
+
+
+def _refind_container(
+    root: etree._Element, previous: _PageState
+) -> Tuple[Optional[etree._Element], List[_Block]]:
+    """Re-locate the remembered container and check it is still the same one.
+
+    Among the elements the locator matches, the one holding most of the
+    previous poll's blocks wins, and only if it holds at least
+    `_MIN_CONTAINER_OVERLAP` of them.
+    """
+    if not previous.container:
+        return None, []
+    prev_fps = [fp for fp, text in previous.blocks.items() if text]
+    best: Optional[etree._Element] = None
+    best_blocks: List[_Block] = []
+    best_hits = -1
+    for candidate in root.xpath(previous.container):
+        blocks = _collect_blocks(candidate)
+        if not prev_fps:
+            return candidate, blocks
+        fps = {b.fingerprint for b in blocks}
+        hits = sum(1 for fp in prev_fps if fp in fps)
+        if hits > best_hits:
+            best, best_blocks, best_hits = candidate, blocks, hits
+    if best is None or best_hits < _MIN_CONTAINER_OVERLAP * len(prev_fps):
+        return None, []
+    return best, best_blocks
+
+
+def _readability_container(
+    html: str, root: etree._Element
+) -> Optional[etree._Element]:
+    """The element of `root` holding readability's main content, if any.
+
+    Readability works on its own copy of the document, so its summary is
+    mapped back to `root` by block text: the container is the deepest
+    common ancestor of the page blocks that appear in the summary.
+    """
+    summary = Document(html).summary(html_partial=True)
+    summary_blocks = _walk(lxml_html.fromstring(summary)) or []
+    wanted = {
+        _block_text(b.el) if b.el is not None else b.text
+        for b in summary_blocks
+    }
+    wanted.discard("")
+    if not wanted:
+        return None
+
+    body = root.find("body")
+    page_blocks = _walk(body if body is not None else root) or []
+    matched = [
+        b.el
+        for b in page_blocks
+        if b.el is not None and _block_text(b.el) in wanted
+    ]
+    if not matched:
+        return None
+
+    common = list(matched[0].iterancestors())[::-1] + [matched[0]]
+    for el in matched[1:]:
+        chain = list(el.iterancestors())[::-1] + [el]
+        n = 0
+        while n < min(len(common), len(chain)) and common[n] is chain[n]:
+            n += 1
+        common = common[:n]
+    container = common[-1]
+    # A single matched paragraph is too narrow to catch new siblings.
+    parent = container.getparent()
+    if len(matched) == 1 and container is matched[0] and parent is not None:
+        container = parent
+    return container
+
+
+def _default_container(root: etree._Element) -> etree._Element:
+    for container in (root.find(".//main"), root.find("body")):
+        if container is not None:
+            return container
+    return root
+
+
+def _meta_content(root: etree._Element, xpath: str) -> Optional[str]:
+    for value in root.xpath(xpath):
+        value = str(value).strip()
+        if value:
+            return value
+    return None
+
+
+def _page_metadata(
+    root: etree._Element, base_url: Optional[str]
+) -> Dict[str, Optional[str]]:
+    title = _meta_content(root, "//head/title/text()")
+    published_date = _meta_content(
+        root,
+        "//meta[@property='article:published_time']/@content"
+        " | //meta[@name='pubdate']/@content"
+        " | //meta[@name='date']/@content"
+        " | //*[@itemprop='datePublished']/@content",
+    )
+    publisher = _meta_content(
+        root, "//meta[@property='og:site_name']/@content"
+    )
+    if not publisher and base_url:
+        publisher = urlparse(base_url).hostname
+    return {
+        "title": title,
+        "published_date": published_date,
+        "publisher": publisher,
+    }
+
+
+def extract_main_text_incremental(
+    html: Union[str, bytes],
+    page_key: Optional[str] = None,
+    base_url: Optional[str] = None,
+    encoding: Optional[str] = None,
+    include_merged_text: bool = True,
+) -> IncrementalExtractResult:
+    """Extract only the blocks that changed since the last poll of a page.
+
+    `page_key` identifies the monitored page (defaults to `base_url`). The
+    first poll of a page returns every block as the delta (`initial=True`).
+    `merged_text` is the full current text, assembled from stored and new
+    blocks; pass `include_merged_text=False` to return only the delta.
+    """
+    key = page_key or base_url
+    if not key:
+        raise ValueError("page_key or base_url is required")
+
+    if isinstance(html, bytes):
+        html = _decode_html(html, encoding or resolve_encoding(html))
+    root = lxml_html.document_fromstring(html)
+    etree.strip_elements(root, *_DROP_TAGS, with_tail=False)
+    metadata = _page_metadata(root, base_url)
+
+    previous = PAGE_STORE.get(key)
+    container: Optional[etree._Element] = None
+    blocks: List[_Block] = []
+    if previous is not None:
+        container, blocks = _refind_container(root, previous)
+    if container is None:
+        # First poll, or the remembered container is gone or no longer
+        # holds the page's content.
+        container = _readability_container(html, root)
+        if container is None:
+            container = _default_container(root)
+        blocks = _collect_blocks(container)
+
+    seen = previous.blocks if previous else {}
+    current: Dict[str, str] = {}
+    order: List[str] = []
+    changed: List[str] = []
+    for block in blocks:
+        fp = block.fingerprint
+        order.append(fp)
+        if fp in current:
+            continue
+        if fp in seen:
+            current[fp] = seen[fp]
+            continue
+        text = block.text if block.el is None else _block_text(block.el)
+        current[fp] = text
+        if text:
+            changed.append(text)
+
+    removed = sum(1 for fp, text in seen.items() if text and fp not in current)
+    PAGE_STORE.put(
+        key, _PageState(blocks=current, container=_locator(container))
+    )
+
+    merged_text = None
+    if include_merged_text:
+        merged_text = "\n".join(
+            current[fp] for fp in order if current[fp]
+        )
+
+    return IncrementalExtractResult(
+        page_key=key,
+        initial=previous is None,
+        delta=ExtractResult(main_text="\n".join(changed), **metadata),
+        merged_text=merged_text,
+        total_blocks=sum(1 for fp in order if current[fp]),
+        changed_blocks=len(changed),
+        removed_blocks=removed,
+    )
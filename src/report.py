@@ -0,0 +1,215 @@
+"""
+Report sessions: build a Markdown report section by section.
+
+`save_report` needs the whole document on every call. A report session keeps
+its parts next to the report instead, so each tool call only transfers the
+section that changed:
+
+    <output_path>                 assembled report (rewritten atomically)
+    <output_path>.parts/
+        manifest.json             title, section order, citations, sources
+        sections/<hash>.md        one file per named section
+
+Sections are written atomically (temp file + rename) and the report is
+re-assembled by streaming the section files, so the full text is never held
+in memory. Sources are stored as `SourceRecord`s keyed by ID; sections cite
+them by ID and a "References" list is rendered from the stored records.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from .server import SourceRecord
+
+_PARTS_SUFFIX = ".parts"
+_MANIFEST = "manifest.json"
+# Section name for a report's content from before its session was opened.
+_IMPORTED = "imported"
+
+# Serializes read-modify-write of manifests (tools may run in threads).
+_LOCK = threading.Lock()
+
+
+class ReportStatus(BaseModel):
+    path: str
+    sections: List[str]
+    sources: int
+    cited_sources: int
+
+
+def _parts_dir(path: Path) -> Path:
+    return path.with_name(path.name + _PARTS_SUFFIX)
+
+
+def _section_file(parts: Path, name: str) -> Path:
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).hexdigest()
+    return parts / "sections" / f"{digest}.md"
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _load_manifest(path: Path) -> Dict[str, Any]:
+    manifest = _parts_dir(path) / _MANIFEST
+    if not manifest.exists():
+        raise ValueError(f"Report not opened: {path}")
+    return json.loads(manifest.read_text(encoding="utf-8"))
+
+
+def _save_manifest(path: Path, manifest: Dict[str, Any]) -> None:
+    _atomic_write_text(
+        _parts_dir(path) / _MANIFEST,
+        json.dumps(manifest, ensure_ascii=False, indent=2),
+    )
+
+
+def _cited_ids(manifest: Dict[str, Any]) -> List[str]:
+    """Cited source IDs in order of first citation."""
+    seen: Dict[str, None] = {}
+    for section in manifest["sections"]:
+        for source_id in section["citations"]:
+            seen.setdefault(source_id, None)
+    return list(seen)
+
+
+def _format_reference(source_id: str, record: SourceRecord) -> str:
+    url = str(record.final_url or record.url)
+    parts = [record.title or url]
+    if record.publisher:
+        parts.append(record.publisher)
+    if record.published_date:
+        parts.append(record.published_date)
+    accessed = record.fetched_at.date().isoformat()
+    return f"- [{source_id}] {', '.join(parts)}. <{url}> (accessed {accessed})"
+
+
+def _assemble(path: Path, manifest: Dict[str, Any]) -> None:
+    """Stream title, sections and references into `path` atomically."""
+    parts = _parts_dir(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as out:
+            if manifest.get("title"):
+                out.write(f"# {manifest['title']}\n\n")
+            for section in manifest["sections"]:
+                with _section_file(parts, section["name"]).open(
+                    "r", encoding="utf-8"
+                ) as f:
+                    shutil.copyfileobj(f, out)
+                out.write("\n\n")
+            cited = _cited_ids(manifest)
+            if cited:
+                out.write("## References\n\n")
+                for source_id in cited:
+                    record = SourceRecord(**manifest["sources"][source_id])
+                    out.write(_format_reference(source_id, record) + "\n")
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _status(path: Path, manifest: Dict[str, Any]) -> ReportStatus:
+    return ReportStatus(
+        path=str(path),
+        sections=[s["name"] for s in manifest["sections"]],
+        sources=len(manifest["sources"]),
+        cited_sources=len(_cited_ids(manifest)),
+    )
+
+
+def open_report(output_path: str, title: Optional[str] = None) -> ReportStatus:
+    """Start (or resume) a report session at `output_path`.
+
+    Re-opening an existing session keeps its sections and sources; a given
+    `title` replaces the stored one. A report that exists without a session
+    (e.g. written by `save_report`) is kept as an initial "imported" section
+    rather than overwritten.
+    """
+    path = Path(output_path)
+    with _LOCK:
+        try:
+            manifest = _load_manifest(path)
+        except ValueError:
+            manifest = {"title": None, "sections": [], "sources": {}}
+            if path.is_file():
+                _atomic_write_text(
+                    _section_file(_parts_dir(path), _IMPORTED),
+                    path.read_text(encoding="utf-8").rstrip("\n"),
+                )
+                manifest["sections"].append(
+                    {"name": _IMPORTED, "citations": []}
+                )
+        if title is not None:
+            manifest["title"] = title
+        _save_manifest(path, manifest)
+        _assemble(path, manifest)
+        return _status(path, manifest)
+
+
+def add_report_sources(
+    output_path: str, sources: Dict[str, SourceRecord]
+) -> ReportStatus:
+    """Store (or update) source records that sections can cite by ID."""
+    path = Path(output_path)
+    with _LOCK:
+        manifest = _load_manifest(path)
+        for source_id, record in sources.items():
+            manifest["sources"][source_id] = record.model_dump(mode="json")
+        _save_manifest(path, manifest)
+        _assemble(path, manifest)
+        return _status(path, manifest)
+
+
+def write_report_section(
+    output_path: str,
+    name: str,
+    markdown_text: str,
+    citations: Optional[List[str]] = None,
+) -> ReportStatus:
+    """Append section `name`, or replace it in place if it already exists.
+
+    `markdown_text` is written verbatim (include the section heading in it).
+    `citations` are IDs of sources added via `add_report_sources`.
+    """
+    path = Path(output_path)
+    citations = list(citations or [])
+    with _LOCK:
+        manifest = _load_manifest(path)
+        unknown = [c for c in citations if c not in manifest["sources"]]
+        if unknown:
+            raise ValueError(f"Unknown source id(s): {', '.join(unknown)}")
+
+        _atomic_write_text(
+            _section_file(_parts_dir(path), name), markdown_text.rstrip("\n")
+        )
+        for section in manifest["sections"]:
+            if section["name"] == name:
+                section["citations"] = citations
+                break
+        else:
+            manifest["sections"].append(
+                {"name": name, "citations": citations}
+            )
+        _save_manifest(path, manifest)
+        _assemble(path, manifest)
+        return _status(path, manifest)
@@ -0,0 +1,268 @@
+"""
+Tail-latency helpers for `fetch_url`: jittered retries, hedged requests and
+per-host circuit breakers.
+
+State (breakers, latency samples) is process-wide so it persists across tool
+calls of a long-running stdio server.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+import requests
+
+from .config import HttpConfig
+
+T = TypeVar("T")
+
+# Latency samples kept per host, and the minimum needed before trusting p95.
+_LATENCY_WINDOW = 50
+_LATENCY_MIN_SAMPLES = 10
+
+_RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Cap on hedge attempts in flight process-wide. A losing attempt holds its
+# slot until its socket finishes or times out; when all slots are taken,
+# calls simply wait on their primary attempt instead of hedging.
+_MAX_HEDGES_IN_FLIGHT = 16
+_HEDGE_SLOTS = threading.BoundedSemaphore(_MAX_HEDGES_IN_FLIGHT)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transport errors and 429/5xx responses are worth another attempt."""
+    if isinstance(exc, requests.HTTPError):
+        resp = exc.response
+        return resp is not None and resp.status_code in _RETRYABLE_STATUS
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+@dataclass
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half_open -> closed."""
+
+    failure_threshold: int
+    reset_seconds: float
+    state: str = "closed"
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    _trial_in_flight: bool = False
+
+    def allow(self, now: float) -> bool:
+        if self.state == "open":
+            if self.opened_at is not None and (
+                now - self.opened_at >= self.reset_seconds
+            ):
+                self.state = "half_open"
+                self._trial_in_flight = False
+            else:
+                return False
+        if self.state == "half_open":
+            # Let exactly one trial request probe the host.
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self, now: float) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or (
+            self.consecutive_failures >= self.failure_threshold
+        ):
+            self.state = "open"
+            self.opened_at = now
+
+
+@dataclass
+class _HostState:
+    breaker: CircuitBreaker
+    latencies: Deque[float] = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_WINDOW)
+    )
+
+
+class HostHealthRegistry:
+    """Per-host breakers and latency samples, safe for concurrent use."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _get(self, host: str, cfg: HttpConfig) -> _HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            st = _HostState(
+                breaker=CircuitBreaker(
+                    failure_threshold=cfg.circuit_failure_threshold,
+                    reset_seconds=cfg.circuit_reset_seconds,
+                )
+            )
+            self._hosts[host] = st
+        return st
+
+    def check(self, host: str, cfg: HttpConfig) -> str:
+        """Raise if the host's breaker rejects the call; else return its
+        state ("closed", or "half_open" for the single trial request).
+        """
+        with self._lock:
+            breaker = self._get(host, cfg).breaker
+            if not breaker.allow(time.monotonic()):
+                raise ValueError(f"Circuit open for host: {host}")
+            return breaker.state
+
+    def record_success(
+        self, host: str, cfg: HttpConfig, latency: Optional[float] = None
+    ) -> None:
+        with self._lock:
+            st = self._get(host, cfg)
+            st.breaker.record_success()
+            if latency is not None:
+                st.latencies.append(latency)
+
+    def record_failure(self, host: str, cfg: HttpConfig) -> None:
+        with self._lock:
+            self._get(host, cfg).breaker.record_failure(time.monotonic())
+
+    def hedge_delay(self, host: str, cfg: HttpConfig) -> float:
+        """p95 of recent latencies, or the configured delay until warmed up."""
+        with self._lock:
+            st = self._hosts.get(host)
+            samples = sorted(st.latencies) if st else []
+        if len(samples) < _LATENCY_MIN_SAMPLES:
+            return cfg.hedge_delay_seconds
+        return samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        out: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for host, st in self._hosts.items():
+                b = st.breaker
+                retry_in = None
+                if b.state == "open" and b.opened_at is not None:
+                    retry_in = max(0.0, b.reset_seconds - (now - b.opened_at))
+                out[host] = {
+                    "state": b.state,
+                    "consecutive_failures": b.consecutive_failures,
+                    "retry_in_seconds": retry_in,
+                    "latency_samples": len(st.latencies),
+                }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+HOST_HEALTH = HostHealthRegistry()
+
+
+def get_circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Per-host breaker state for inspection (tools, logs, tests)."""
+    return HOST_HEALTH.snapshot()
+
+
+def _spawn(attempt: Callable[[], T], on_done: Callable[[], None]) -> Future:
+    """Run `attempt` on its own daemon thread (never queued behind others)."""
+    fut: Future = Future()
+
+    def run() -> None:
+        try:
+            fut.set_result(attempt())
+        except BaseException as exc:
+            fut.set_exception(exc)
+        finally:
+            on_done()
+
+    fut.set_running_or_notify_cancel()
+    threading.Thread(target=run, name="fetch-attempt", daemon=True).start()
+    return fut
+
+
+def _hedged(attempt: Callable[[], T], delay: float) -> T:
+    """Run `attempt`; if it is still pending after `delay`, race a second.
+
+    The primary gets a dedicated thread so it never waits in a queue, and
+    the caller stays free to return whichever attempt succeeds first. The
+    hedge only runs if a slot is free. If both attempts fail, the first
+    error raised is re-raised.
+    """
+    first = _spawn(attempt, lambda: None)
+    done, _ = wait([first], timeout=delay)
+    if done or not _HEDGE_SLOTS.acquire(blocking=False):
+        return first.result()
+
+    pending = {first, _spawn(attempt, _HEDGE_SLOTS.release)}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for fut in done:
+            exc = fut.exception()
+            if exc is None:
+                # The loser keeps running; requests cannot be cancelled
+                # mid-flight, so its result is simply dropped.
+                return fut.result()
+            error = error or exc
+    assert error is not None
+    raise error
+
+
+def call_with_resilience(
+    host: str, cfg: HttpConfig, attempt: Callable[[], T]
+) -> T:
+    """Run an idempotent `attempt` under the host's breaker, with retries
+    (full-jitter exponential backoff) and optional hedging.
+
+    Retries stay within a total latency budget (`retry_budget_seconds`,
+    default `timeout_seconds`): a retry is only started if the elapsed time,
+    the backoff and another attempt as long as the last one fit in it. A
+    host that hangs until the timeout therefore costs about one timeout.
+    """
+    state = HOST_HEALTH.check(host, cfg)
+    budget = cfg.retry_budget_seconds
+    if budget is None:
+        budget = cfg.timeout_seconds
+    call_started = time.monotonic()
+    tries = max(0, cfg.max_retries) + 1
+    for i in range(tries):
+        started = time.monotonic()
+        try:
+            # A half-open breaker admits exactly one trial request.
+            if cfg.hedge_requests and state == "closed":
+                result = _hedged(attempt, HOST_HEALTH.hedge_delay(host, cfg))
+            else:
+                result = attempt()
+        except Exception as exc:
+            if not is_retryable(exc):
+                # e.g. a 404 or an oversized body: the host itself is up.
+                HOST_HEALTH.record_success(host, cfg)
+                raise
+            HOST_HEALTH.record_failure(host, cfg)
+            if i == tries - 1:
+                raise
+            now = time.monotonic()
+            cap = min(
+                cfg.retry_backoff_max_seconds,
+                cfg.retry_backoff_seconds * (2**i),
+            )
+            backoff = random.uniform(0, cap)
+            if (now - call_started) + backoff + (now - started) > budget:
+                raise
+            state = HOST_HEALTH.check(host, cfg)
+            time.sleep(backoff)
+            continue
+        HOST_HEALTH.record_success(host, cfg, time.monotonic() - started)
+        return result
+    raise AssertionError("unreachable")  # pragma: no cover
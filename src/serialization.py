@@ -0,0 +1,34 @@
+"""
+Serialization helpers shared by the stdio servers.
+
+Tool results are pydantic models (or containers of them). Dumping them via a
+cached `TypeAdapter` straight to JSON bytes avoids the
+`model_dump()` -> `json.dumps()` -> `str.encode()` chain, which holds several
+full copies of large payloads (e.g. 5 MB of HTML) at once.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """Return a process-wide cached `TypeAdapter` for `tp`.
+
+    Building an adapter compiles a core schema, which costs far more than a
+    typical dump; callers should never construct one per response.
+    """
+    return TypeAdapter(tp)
+
+
+def dump_json(obj: Any, tp: Any = Any) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    return type_adapter(tp).dump_json(obj)
+
+
+def to_jsonable(obj: Any, tp: Any = Any) -> Any:
+    """Convert `obj` to JSON-compatible Python data in one pass."""
+    return type_adapter(tp).dump_python(obj, mode="json")
@@ -5,29 +5,53 @@ the platform expects.
 """
 from __future__ import annotations
 
+import codecs
+import hashlib
 import json
 import logging
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, computed_field
+from requests.compat import chardet
 from readability import Document
 
 from .config import AppConfig, load_config
+from .resilience import call_with_resilience
 
 logger = logging.getLogger(__name__)
 
 
 class FetchResult(BaseModel):
-    final_url: HttpUrl
+    # Built by fetch_url from the response itself (see model_construct
+    # there), so the URL is trusted and kept as a plain string.
+    final_url: str
     status_code: int
     fetched_at: datetime
     content_type: Optional[str] = None
-    html: str
+    encoding: Optional[str] = None
+    # Raw response body, the only copy kept. Not serialized itself; tool
+    # results carry `html`, which is decoded from it on demand.
+    content: bytes = Field(default=b"", exclude=True, repr=False)
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def html(self) -> str:
+        """Decoded body. Not cached: each access decodes `content` again,
+        so in-process callers should pass `content` to extract_main_text.
+        """
+        encoding = self.encoding or resolve_encoding(
+            self.content, self.content_type
+        )
+        return _decode_html(self.content, encoding)
 
 
 class ExtractResult(BaseModel):
@@ -56,29 +80,123 @@ def _check_allowlist(url: str, allow_domains: Optional[List[str]]) -> None:
         raise ValueError(f"Domain not allowed by allowlist: {host}")
 
 
+# Bytes scanned for <meta charset> (the HTML spec prescans 1024 bytes; some
+# CMS templates push the tag further down behind long comments/scripts).
+_META_SCAN_BYTES = 4096
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Labels whose de-facto meaning on the web is a superset codec.
+_ENCODING_ALIASES = {
+    "shift_jis": "cp932",
+    "shift-jis": "cp932",
+    "sjis": "cp932",
+    "x-sjis": "cp932",
+    "ms_kanji": "cp932",
+    "windows-31j": "cp932",
+    "iso-8859-1": "cp1252",
+    "latin-1": "cp1252",
+    "us-ascii": "cp1252",
+}
+
+_CHARSET_HEADER_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(
+    rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I
+)
+
+
+def _normalize_encoding(label: Optional[str]) -> Optional[str]:
+    if not label:
+        return None
+    label = label.strip().lower()
+    label = _ENCODING_ALIASES.get(label, label)
+    try:
+        codecs.lookup(label)
+    except LookupError:
+        return None
+    return label
+
+
+def resolve_encoding(
+    content: bytes, content_type: Optional[str] = None
+) -> str:
+    """Resolve the charset of an HTML body.
+
+    Order: Content-Type header, BOM, bounded <meta charset> scan, a strict
+    UTF-8 probe, and only then statistical detection over the whole body.
+    """
+    if content_type:
+        m = _CHARSET_HEADER_RE.search(content_type)
+        enc = _normalize_encoding(m.group(1)) if m else None
+        if enc:
+            return enc
+
+    for bom, enc in _BOMS:
+        if content.startswith(bom):
+            return enc
+
+    m = _META_CHARSET_RE.search(content[:_META_SCAN_BYTES])
+    enc = _normalize_encoding(m.group(1).decode("ascii")) if m else None
+    if enc:
+        # A UTF-16 label in an ASCII-compatible document is a lie.
+        return "utf-8" if enc.startswith("utf-16") else enc
+
+    try:
+        content.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+
+    detected = chardet.detect(content).get("encoding") if content else None
+    return _normalize_encoding(detected) or "utf-8"
+
+
+def _decode_html(content: bytes, encoding: str) -> str:
+    # The "utf-16" codec consumes the BOM itself; utf-8 needs utf-8-sig.
+    if encoding == "utf-8":
+        encoding = "utf-8-sig"
+    return content.decode(encoding, errors="replace")
+
+
 def fetch_url(url: str, cfg: Optional[AppConfig] = None) -> FetchResult:
     cfg = cfg or load_config()
     _check_allowlist(url, cfg.http.allow_domains)
 
     headers = {"User-Agent": cfg.http.user_agent}
-    resp = requests.get(
-        url,
-        headers=headers,
-        timeout=cfg.http.timeout_seconds,
-        allow_redirects=True,
-    )
-    if cfg.http.max_content_length and (
-        len(resp.content) > cfg.http.max_content_length
-    ):
-        raise ValueError("Content too large; aborted")
-    resp.raise_for_status()
+
+    def attempt() -> requests.Response:
+        resp = requests.get(
+            url,
+            headers=headers,
+            timeout=cfg.http.timeout_seconds,
+            allow_redirects=True,
+        )
+        if cfg.http.max_content_length and (
+            len(resp.content) > cfg.http.max_content_length
+        ):
+            raise ValueError("Content too large; aborted")
+        resp.raise_for_status()
+        return resp
+
+    host = urlparse(url).hostname or ""
+    resp = call_with_resilience(host, cfg.http, attempt)
     fetched_at = datetime.now(timezone.utc)
-    return FetchResult(
+    content = resp.content
+    content_type = resp.headers.get("content-type")
+    encoding = resolve_encoding(content, content_type)
+    # All values come from requests; skip validation (URL parsing, and a copy
+    # of the raw body for the bytes field).
+    return FetchResult.model_construct(
         final_url=resp.url,
         status_code=resp.status_code,
         fetched_at=fetched_at,
-        content_type=resp.headers.get("content-type"),
-        html=resp.text,
+        content_type=content_type,
+        encoding=encoding,
+        content=content,
     )
 
 
@@ -116,8 +234,19 @@ def _extract_publisher(
 
 
 def extract_main_text(
-    html: str, base_url: Optional[str] = None
+    html: Union[str, bytes],
+    base_url: Optional[str] = None,
+    encoding: Optional[str] = None,
 ) -> ExtractResult:
+    """Extract main text and metadata from HTML.
+
+    `html` may be raw bytes (e.g. `FetchResult.content`); it is then decoded
+    once with `encoding` (or `resolve_encoding`) instead of letting
+    readability/bs4 each run their own charset detection.
+    """
+    if isinstance(html, bytes):
+        html = _decode_html(html, encoding or resolve_encoding(html))
+
     doc = Document(html)
     main_html = doc.summary(html_partial=True)
     title = doc.short_title()
@@ -174,6 +303,108 @@ class EvidenceExcerpt(BaseModel):
     position: str
 
 
+# Sentence terminators: Japanese/full-width and English ?!, closing
+# brackets/quotes that belong to the sentence, a "." only when followed by
+# whitespace (so "12.5" and "example.com" stay intact) and not after a
+# single capital ("U.S."), and line breaks (extract_main_text joins blocks
+# with "\n"). Trailing whitespace is consumed so each offset points at the
+# next sentence's first character.
+_SENTENCE_END_RE = re.compile(
+    r"(?:[。．！？!?]+[」』）)\"'’”]*"
+    r"|(?<!\b[A-Z])\.[\"'’”)]*(?=\s|$)"
+    r"|\n)\s*"
+)
+
+# Offsets of recently seen texts, keyed by a digest of the text so the cache
+# never keeps (multi-MB) texts alive itself; the caller owns the text.
+_SENTENCE_CACHE_SIZE = 8
+_SENTENCE_CACHE: "OrderedDict[bytes, Tuple[int, ...]]" = OrderedDict()
+_SENTENCE_CACHE_LOCK = threading.Lock()
+
+
+def _text_digest(text: str) -> bytes:
+    raw = text.encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def sentence_offsets(text: str) -> Tuple[int, ...]:
+    """Start offsets of each sentence in `text` (always starts with 0).
+
+    Computed once per text and cached, so every claim against the same text
+    reuses the same index.
+    """
+    key = _text_digest(text)
+    with _SENTENCE_CACHE_LOCK:
+        cached = _SENTENCE_CACHE.get(key)
+        if cached is not None:
+            _SENTENCE_CACHE.move_to_end(key)
+            return cached
+
+    starts = [0]
+    n = len(text)
+    for m in _SENTENCE_END_RE.finditer(text):
+        if 0 < m.end() < n:
+            starts.append(m.end())
+    offsets = tuple(starts)
+
+    with _SENTENCE_CACHE_LOCK:
+        _SENTENCE_CACHE[key] = offsets
+        while len(_SENTENCE_CACHE) > _SENTENCE_CACHE_SIZE:
+            _SENTENCE_CACHE.popitem(last=False)
+    return offsets
+
+
+def _sentence_end(text: str, starts: Tuple[int, ...], j: int) -> int:
+    """End offset of sentence j-1, i.e. start of sentence j (or len)."""
+    return starts[j] if j < len(starts) else len(text)
+
+
+def _rstrip_end(text: str, start: int, end: int) -> int:
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end
+
+
+def _snap_excerpt(
+    text: str, starts: Tuple[int, ...], idx: int, length: int, max_chars: int
+) -> Tuple[int, int]:
+    """Pick [start, end) covering text[idx:idx+length] on sentence boundaries.
+
+    Starts from the sentence(s) containing the match and grows by whole
+    neighbouring sentences (before, then after) while within `max_chars`.
+    If the matching sentences alone are too long, falls back to a window
+    centred on the match inside them.
+    """
+    i = bisect_right(starts, idx) - 1
+    j = bisect_left(starts, idx + max(length, 1))
+    start = starts[i]
+    end = _rstrip_end(text, start, _sentence_end(text, starts, j))
+
+    if end - start > max_chars:
+        pad = max(0, (max_chars - length) // 2)
+        start = max(start, idx - pad)
+        end = min(end, start + max_chars)
+        start = max(starts[i], end - max_chars)
+        return start, end
+
+    grew = True
+    while grew:
+        grew = False
+        if i > 0 and end - starts[i - 1] <= max_chars:
+            i -= 1
+            start = starts[i]
+            grew = True
+        if j < len(starts):
+            new_end = _rstrip_end(
+                text, start, _sentence_end(text, starts, j + 1)
+            )
+            if new_end - start <= max_chars:
+                j += 1
+                end = new_end
+                grew = True
+    return start, end
+
+
 def extract_evidence_quotes(
     text: str,
     claims: List[str],
@@ -182,29 +413,37 @@ def extract_evidence_quotes(
 ) -> List[EvidenceExcerpt]:
     """Heuristic excerpt picker: find claim substring or take leading snippet.
     Enforces max_chars (agent_spec: 500 chars max per excerpt).
+
+    Excerpts snap to sentence boundaries (see `sentence_offsets`) and
+    `position` gives the exact `chars <start>-<end>` of the excerpt.
     """
 
+    starts = sentence_offsets(text)
     excerpts: List[EvidenceExcerpt] = []
     for claim in claims:
-        lower_text = text.lower()
-        lower_claim = claim.lower()
-        idx = lower_text.find(lower_claim) if lower_claim else -1
-        if idx >= 0:
-            start = max(0, idx - 120)
-            end = min(len(text), idx + len(claim) + 120)
-            snippet = text[start:end]
+        # Case-insensitive search on the text itself: no lowercased copy of
+        # the text, and match offsets always line up with `text`.
+        m = re.search(re.escape(claim), text, re.IGNORECASE) if claim else None
+        if m is not None:
+            start, end = _snap_excerpt(
+                text, starts, m.start(), m.end() - m.start(), max_chars
+            )
             position = f"chars {start}-{end}"
         else:
-            snippet = text[: max_chars]
+            # Leading whole sentences that fit.
+            start = 0
+            if len(text) <= max_chars:
+                end = len(text)
+            else:
+                k = bisect_right(starts, max_chars) - 1
+                end = starts[k] if k > 0 else max_chars
+            end = _rstrip_end(text, start, end)
             position = default_position
 
-        if len(snippet) > max_chars:
-            snippet = snippet[: max_chars]
-
         excerpts.append(
             EvidenceExcerpt(
                 claim=claim,
-                excerpt=snippet,
+                excerpt=text[start:end],
                 position=position,
             )
         )
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from src.monitor import extract_main_text_incremental, reset_page_monitor
+
+
+def _liveblog(entries: List[str]) -> str:
+    posts = "".join(f"<article><p>{e}</p></article>" for e in entries)
+    return f"""
+    <html>
+      <head>
+        <title>CES keynote live</title>
+        <meta property="og:site_name" content="ExampleNews" />
+      </head>
+      <body>
+        <nav><a href="/">Home</a></nav>
+        <main><h1>CES keynote</h1>{posts}</main>
+        <footer>(c) ExampleNews</footer>
+        <script>var x = 1;</script>
+      </body>
+    </html>
+    """
+
+
+@pytest.fixture(autouse=True)
+def _reset_monitor():
+    reset_page_monitor()
+    yield
+    reset_page_monitor()
+
+
+def test_initial_poll_returns_all_blocks() -> None:
+    r = extract_main_text_incremental(
+        _liveblog(["First update"]), base_url="https://example.com/live"
+    )
+
+    assert r.initial is True
+    assert r.page_key == "https://example.com/live"
+    assert r.delta.main_text == "CES keynote\nFirst update"
+    assert r.merged_text == r.delta.main_text
+    assert r.delta.title == "CES keynote live"
+    assert r.delta.publisher == "ExampleNews"
+    assert "Home" not in r.merged_text
+    assert r.total_blocks == r.changed_blocks == 2
+
+
+def test_subsequent_poll_returns_only_new_blocks() -> None:
+    extract_main_text_incremental(
+        _liveblog(["First update", "Second update"]), page_key="live"
+    )
+    r = extract_main_text_incremental(
+        _liveblog(["First update", "Second update", "新製品を発表"]),
+        page_key="live",
+    )
+
+    assert r.initial is False
+    assert r.delta.main_text == "新製品を発表"
+    assert r.changed_blocks == 1
+    assert r.removed_blocks == 0
+    assert r.merged_text == (
+        "CES keynote\nFirst update\nSecond update\n新製品を発表"
+    )
+
+
+def test_changed_and_removed_blocks() -> None:
+    extract_main_text_incremental(_liveblog(["A", "B"]), page_key="live")
+    r = extract_main_text_incremental(
+        _liveblog(["A (corrected)"]),
+        page_key="live",
+        include_merged_text=False,
+    )
+
+    assert r.delta.main_text == "A (corrected)"
+    assert r.changed_blocks == 1
+    assert r.removed_blocks == 2
+    assert r.merged_text is None
+
+
+def test_pages_are_tracked_independently() -> None:
+    extract_main_text_incremental(_liveblog(["A"]), page_key="one")
+    r = extract_main_text_incremental(_liveblog(["A"]), page_key="two")
+    assert r.initial is True
+    assert r.changed_blocks == 2
+
+
+def test_accepts_bytes() -> None:
+    html = (
+        '<html><head><meta charset="shift_jis"></head>'
+        "<body><p>基調講演が始まりました。</p></body></html>"
+    ).encode("cp932")
+    r = extract_main_text_incremental(html, page_key="sjis")
+    assert r.delta.main_text == "基調講演が始まりました。"
+
+
+def test_requires_page_key_or_base_url() -> None:
+    with pytest.raises(ValueError, match="page_key or base_url"):
+        extract_main_text_incremental("<html></html>")
+
+
+def test_mixed_inline_and_block_content_is_kept() -> None:
+    html = (
+        "<html><body><main>"
+        "<div>Intro text <p>para one</p> trailing text</div>"
+        "<li>Item lead<p>nested</p></li>"
+        "<span>loose span text</span>"
+        "</main></body></html>"
+    )
+    r = extract_main_text_incremental(html, page_key="mixed")
+    assert r.merged_text == (
+        "Intro text\npara one\ntrailing text\nItem lead\nnested\n"
+        "loose span text"
+    )
+
+    # Appending bare text to the post re-extracts only that run.
+    r = extract_main_text_incremental(
+        html.replace("trailing text", "trailing text (updated)"),
+        page_key="mixed",
+    )
+    assert r.delta.main_text == "trailing text (updated)"
+    assert r.changed_blocks == 1
+    assert r.removed_blocks == 1
+
+
+def test_body_text_with_br_only() -> None:
+    r = extract_main_text_incremental(
+        "<html><body>Just body text<br>more text</body></html>",
+        page_key="br",
+    )
+    assert r.merged_text == "Just body text\nmore text"
+
+
+_ENTRY = (
+    "Update {}: the keynote presenter showed a new processor with many "
+    "cores, and said it will ship later this year, according to the company."
+)
+
+
+def _page_with_chrome(n: int) -> str:
+    entries = "".join(
+        f"<div class='entry'><p>{_ENTRY.format(i)}</p></div>"
+        for i in range(n)
+    )
+    return (
+        "<html><head><title>Live</title></head><body>"
+        "<header><div>Site header menu</div></header>"
+        "<div id='cookie'>We use cookies. Accept all cookies.</div>"
+        f"<div class='layout'><div id='live'>{entries}</div>"
+        "<div class='related'><ul><li><a href='/a'>Other story</a></li>"
+        "</ul></div></div></body></html>"
+    )
+
+
+def test_readability_container_is_chosen_and_reused(monkeypatch) -> None:
+    import src.monitor as monitor
+
+    calls = []
+    real_document = monitor.Document
+
+    def counting_document(*args, **kwargs):
+        calls.append(1)
+        return real_document(*args, **kwargs)
+
+    monkeypatch.setattr(monitor, "Document", counting_document)
+
+    r = extract_main_text_incremental(_page_with_chrome(4), page_key="live")
+    assert r.total_blocks == 4
+    for chrome in ("Site header", "cookies", "Other story"):
+        assert chrome not in r.merged_text
+
+    r = extract_main_text_incremental(_page_with_chrome(5), page_key="live")
+    assert r.delta.main_text == _ENTRY.format(4)
+    assert r.total_blocks == 5
+    assert len(calls) == 1
+
+
+def test_form_wrapped_page_is_extracted() -> None:
+    # ASP.NET WebForms pages wrap the whole body in a <form>.
+    html = (
+        "<html><body><form id='aspnetForm'><div>"
+        "<h1>決算発表</h1><p>売上高は前年比10%増加しました。</p>"
+        "<p>営業利益は過去最高となりました。</p>"
+        "<input type='hidden' name='__VIEWSTATE' value='x'>"
+        "<button>送信</button>"
+        "</div></form></body></html>"
+    )
+    r = extract_main_text_incremental(html, page_key="ir")
+    assert r.merged_text == (
+        "決算発表\n売上高は前年比10%増加しました。\n"
+        "営業利益は過去最高となりました。"
+    )
+    assert r.total_blocks == 3
+
+
+def _story_page(n: int, before: str = "", story_class: str = "story") -> str:
+    paragraphs = "".join(f"<p>{_ENTRY.format(i)}</p>" for i in range(n))
+    return (
+        f"<html><body>{before}"
+        "<div class='top'><a href='/'>Top</a></div>"
+        f"<div class='{story_class}'><h1>Keynote</h1>{paragraphs}</div>"
+        "<div class='links'><a href='/c'>Contact</a></div>"
+        "</body></html>"
+    )
+
+
+def test_container_survives_inserted_sibling() -> None:
+    extract_main_text_incremental(_story_page(4), page_key="a")
+    # A banner inserted before the container shifts positional XPaths;
+    # one sharing the container's class makes the locator ambiguous.
+    banner = "<div class='story'><p>Breaking: alert</p></div>"
+    r = extract_main_text_incremental(
+        _story_page(5, before=banner), page_key="a"
+    )
+
+    assert r.delta.main_text == _ENTRY.format(4)
+    assert r.changed_blocks == 1
+    assert r.removed_blocks == 0
+    assert "Breaking" not in r.merged_text
+
+
+def test_container_rechosen_when_locator_hits_other_content(
+    monkeypatch,
+) -> None:
+    import src.monitor as monitor
+
+    calls = []
+    real_document = monitor.Document
+
+    def counting_document(*args, **kwargs):
+        calls.append(1)
+        return real_document(*args, **kwargs)
+
+    monkeypatch.setattr(monitor, "Document", counting_document)
+
+    extract_main_text_incremental(_story_page(4), page_key="b")
+    # The remembered class now holds a promo; the article moved.
+    promo = "<div class='story'><p>Promo: subscribe now</p></div>"
+    r = extract_main_text_incremental(
+        _story_page(5, before=promo, story_class="story-live"),
+        page_key="b",
+    )
+
+    assert len(calls) == 2
+    assert r.delta.main_text == _ENTRY.format(4)
+    assert r.removed_blocks == 0
+    assert "Promo" not in r.merged_text
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.report import add_report_sources, open_report, write_report_section
+from src.server import SourceRecord, save_report
+
+
+def _record(url: str, title: str) -> SourceRecord:
+    return SourceRecord(
+        url=url,
+        fetched_at=datetime(2026, 1, 7, tzinfo=timezone.utc),
+        title=title,
+        publisher="ExampleNews",
+        published_date="2026-01-06",
+    )
+
+
+def test_sections_append_and_replace_in_place(tmp_path: Path) -> None:
+    report = tmp_path / "reports" / "ces.md"
+    status = open_report(str(report), title="CES 2026")
+    assert status.sections == []
+    assert report.read_text(encoding="utf-8") == "# CES 2026\n\n"
+
+    write_report_section(str(report), "summary", "## Summary\n\nv1")
+    write_report_section(str(report), "trends", "## Trends\n\nAI PCs")
+    status = write_report_section(str(report), "summary", "## Summary\n\nv2")
+
+    assert status.sections == ["summary", "trends"]
+    text = report.read_text(encoding="utf-8")
+    assert text == (
+        "# CES 2026\n\n## Summary\n\nv2\n\n## Trends\n\nAI PCs\n\n"
+    )
+
+
+def test_citations_render_references_from_sources(tmp_path: Path) -> None:
+    report = tmp_path / "report.md"
+    open_report(str(report))
+    add_report_sources(
+        str(report),
+        {
+            "s1": _record("https://example.com/a", "Keynote recap"),
+            "s2": _record("https://example.com/b", "Unused"),
+        },
+    )
+    status = write_report_section(
+        str(report), "trends", "## Trends\n\nAI PCs [s1]", citations=["s1"]
+    )
+
+    assert status.sources == 2
+    assert status.cited_sources == 1
+    text = report.read_text(encoding="utf-8")
+    assert "## References" in text
+    assert (
+        "- [s1] Keynote recap, ExampleNews, 2026-01-06. "
+        "<https://example.com/a> (accessed 2026-01-07)"
+    ) in text
+    assert "Unused" not in text
+
+
+def test_unknown_citation_rejected(tmp_path: Path) -> None:
+    report = tmp_path / "report.md"
+    open_report(str(report))
+    with pytest.raises(ValueError, match="Unknown source id"):
+        write_report_section(str(report), "a", "text", citations=["nope"])
+    assert open_report(str(report)).sections == []
+
+
+def test_section_requires_open_report(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Report not opened"):
+        write_report_section(str(tmp_path / "r.md"), "a", "text")
+
+
+def test_reopen_resumes_session(tmp_path: Path) -> None:
+    report = tmp_path / "report.md"
+    open_report(str(report), title="Draft")
+    write_report_section(str(report), "intro", "Intro")
+    status = open_report(str(report), title="Final")
+
+    assert status.sections == ["intro"]
+    assert report.read_text(encoding="utf-8").startswith("# Final\n\nIntro")
+
+
+def test_open_report_imports_existing_file(tmp_path: Path) -> None:
+    report = tmp_path / "report.md"
+    save_report("# Draft\n\nWritten before the session.\n", str(report))
+
+    status = open_report(str(report))
+    assert status.sections == ["imported"]
+    assert report.read_text(encoding="utf-8") == (
+        "# Draft\n\nWritten before the session.\n\n"
+    )
+
+    write_report_section(str(report), "trends", "## Trends\n\nAI PCs")
+    assert report.read_text(encoding="utf-8").startswith(
+        "# Draft\n\nWritten before the session.\n"
+    )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from src.config import AppConfig, ExcerptConfig, HttpConfig, PathsConfig
+from src.resilience import HOST_HEALTH, get_circuit_breaker_states
+from src.server import fetch_url
+
+
+class _FakeResponse:
+    def __init__(self, url: str, status_code: int = 200):
+        self.url = url
+        self.status_code = status_code
+        self.headers = {"content-type": "text/html; charset=utf-8"}
+        self.content = b"<html>ok</html>"
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+def _cfg(**http: Any) -> AppConfig:
+    http.setdefault("allow_domains", ["example.com"])
+    http.setdefault("retry_backoff_seconds", 0)
+    return AppConfig(
+        http=HttpConfig(**http),
+        paths=PathsConfig(),
+        excerpts=ExcerptConfig(),
+    )
+
+
+@pytest.fixture(autouse=True)
+def _reset_host_health():
+    HOST_HEALTH.reset()
+    yield
+    HOST_HEALTH.reset()
+
+
+def test_fetch_url_retries_transient_errors() -> None:
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        if len(calls) == 1:
+            raise requests.ConnectionError("reset")
+        if len(calls) == 2:
+            return _FakeResponse(url, status_code=503)
+        return _FakeResponse(url)
+
+    with patch("requests.get", new=fake_get):
+        r = fetch_url("https://example.com/a", _cfg(max_retries=2))
+
+    assert r.status_code == 200
+    assert len(calls) == 3
+    assert get_circuit_breaker_states()["example.com"]["state"] == "closed"
+
+
+def test_fetch_url_does_not_retry_client_errors() -> None:
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        return _FakeResponse(url, status_code=404)
+
+    with patch("requests.get", new=fake_get):
+        with pytest.raises(requests.HTTPError):
+            fetch_url("https://example.com/a", _cfg(max_retries=3))
+
+    assert len(calls) == 1
+
+
+def test_circuit_opens_and_fails_fast() -> None:
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        raise requests.Timeout("slow")
+
+    cfg = _cfg(
+        max_retries=0,
+        circuit_failure_threshold=2,
+        circuit_reset_seconds=60,
+    )
+    with patch("requests.get", new=fake_get):
+        for _ in range(2):
+            with pytest.raises(requests.Timeout):
+                fetch_url("https://example.com/a", cfg)
+        with pytest.raises(ValueError, match="Circuit open"):
+            fetch_url("https://example.com/a", cfg)
+
+    assert len(calls) == 2
+    state = get_circuit_breaker_states()["example.com"]
+    assert state["state"] == "open"
+    assert state["retry_in_seconds"] > 0
+
+
+def test_circuit_half_open_trial_closes_on_success() -> None:
+    fail = True
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        if fail:
+            raise requests.ConnectionError("down")
+        return _FakeResponse(url)
+
+    cfg = _cfg(
+        max_retries=0,
+        circuit_failure_threshold=1,
+        circuit_reset_seconds=0,
+    )
+    with patch("requests.get", new=fake_get):
+        with pytest.raises(requests.ConnectionError):
+            fetch_url("https://example.com/a", cfg)
+        assert get_circuit_breaker_states()["example.com"]["state"] == "open"
+        fail = False
+        fetch_url("https://example.com/a", cfg)
+
+    assert get_circuit_breaker_states()["example.com"]["state"] == "closed"
+
+
+def test_hedged_request_returns_faster_attempt() -> None:
+    lock = threading.Lock()
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        with lock:
+            calls.append(1)
+            n = len(calls)
+        if n == 1:
+            time.sleep(1.0)
+            return _FakeResponse(url + "?slow")
+        return _FakeResponse(url + "?fast")
+
+    cfg = _cfg(hedge_requests=True, hedge_delay_seconds=0.05)
+    with patch("requests.get", new=fake_get):
+        started = time.monotonic()
+        r = fetch_url("https://example.com/a", cfg)
+        elapsed = time.monotonic() - started
+
+    assert str(r.final_url).endswith("fast")
+    assert elapsed < 0.9
+    assert len(calls) == 2
+
+
+def test_retry_budget_bounds_wall_time_for_hanging_host() -> None:
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        time.sleep(0.4)
+        raise requests.Timeout("hung")
+
+    # Budget defaults to timeout_seconds: a second 0.4 s attempt still fits
+    # in 1 s, a third would not.
+    cfg = _cfg(max_retries=5, timeout_seconds=1)
+    with patch("requests.get", new=fake_get):
+        started = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            fetch_url("https://example.com/a", cfg)
+        elapsed = time.monotonic() - started
+
+    assert len(calls) == 2
+    assert elapsed < 1.0
+
+
+def test_no_hedge_while_half_open() -> None:
+    calls: List[int] = []
+    fail = True
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        if fail:
+            raise requests.ConnectionError("down")
+        time.sleep(0.2)
+        return _FakeResponse(url)
+
+    cfg = _cfg(
+        max_retries=0,
+        circuit_failure_threshold=1,
+        circuit_reset_seconds=0,
+        hedge_requests=True,
+        hedge_delay_seconds=0.01,
+    )
+    with patch("requests.get", new=fake_get):
+        with pytest.raises(requests.ConnectionError):
+            fetch_url("https://example.com/a", cfg)
+        fail = False
+        calls.clear()
+        fetch_url("https://example.com/a", cfg)
+
+    assert len(calls) == 1
+    assert get_circuit_breaker_states()["example.com"]["state"] == "closed"
+
+
+def test_hedge_skipped_when_no_slot_free(monkeypatch) -> None:
+    import src.resilience as resilience
+
+    monkeypatch.setattr(resilience, "_HEDGE_SLOTS", threading.Semaphore(0))
+    calls: List[int] = []
+
+    def fake_get(url: str, **kwargs: Any) -> _FakeResponse:
+        calls.append(1)
+        time.sleep(0.1)
+        return _FakeResponse(url)
+
+    cfg = _cfg(hedge_requests=True, hedge_delay_seconds=0.01)
+    with patch("requests.get", new=fake_get):
+        r = fetch_url("https://example.com/a", cfg)
+
+    assert r.status_code == 200
+    assert len(calls) == 1
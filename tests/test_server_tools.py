@@ -14,18 +14,27 @@ from src.server import (
     extract_evidence_quotes,
     extract_main_text,
     fetch_url,
+    resolve_encoding,
     save_report,
     save_sources,
+    sentence_offsets,
 )
 
 
 class _FakeResponse:
-    def __init__(self, url: str, text: str, status_code: int = 200):
+    def __init__(
+        self,
+        url: str,
+        text: str,
+        status_code: int = 200,
+        content: bytes | None = None,
+        content_type: str = "text/html; charset=utf-8",
+    ):
         self.url = url
         self.text = text
         self.status_code = status_code
-        self.headers = {"content-type": "text/html; charset=utf-8"}
-        self.content = text.encode("utf-8")
+        self.headers = {"content-type": content_type}
+        self.content = text.encode("utf-8") if content is None else content
 
     def raise_for_status(self) -> None:
         if self.status_code >= 400:
@@ -81,6 +90,65 @@ def test_fetch_url_max_content_length_enforced() -> None:
             fetch_url("https://example.com/start", cfg)
 
 
+def test_fetch_url_resolves_meta_charset_without_header() -> None:
+    cfg = AppConfig(
+        http=HttpConfig(allow_domains=["example.com"], timeout_seconds=1),
+        paths=PathsConfig(),
+        excerpts=ExcerptConfig(),
+    )
+    body = (
+        '<html><head><meta charset="Shift_JIS"></head>'
+        "<body><p>新製品を発表</p></body></html>"
+    ).encode("cp932")
+
+    def fake_get(*args: Any, **kwargs: Any) -> _FakeResponse:
+        return _FakeResponse(
+            url="https://example.com/final",
+            text="",
+            content=body,
+            content_type="text/html",
+        )
+
+    with patch("requests.get", new=fake_get):
+        r = fetch_url("https://example.com/start", cfg)
+
+    assert r.encoding == "cp932"
+    assert "新製品を発表" in r.html
+    assert r.content == body
+    # Only the bytes are stored; html is decoded when accessed/serialized.
+    assert "html" not in r.__dict__
+    dumped = r.model_dump()
+    assert "content" not in dumped
+    assert "新製品を発表" in dumped["html"]
+
+
+def test_resolve_encoding_order() -> None:
+    euc = '<meta charset="euc-jp"><p>日本語</p>'.encode("euc_jp")
+    # Header wins over meta.
+    assert resolve_encoding(euc, "text/html; charset=UTF-8") == "utf-8"
+    # BOM wins over meta.
+    assert resolve_encoding(b"\xef\xbb\xbf" + euc, "text/html") == "utf-8"
+    assert resolve_encoding(euc, "text/html") == "euc-jp"
+    # Unknown labels fall through to detection.
+    assert resolve_encoding(b"plain ascii", "text/html; charset=bogus")
+
+
+def test_extract_main_text_accepts_bytes() -> None:
+    html = (
+        "<html><head><title>決算発表</title>"
+        '<meta http-equiv="Content-Type" content="text/html; charset=EUC-JP">'
+        "</head><body><article><p>売上高は前年比10%増加しました。</p>"
+        "</article></body></html>"
+    ).encode("euc_jp")
+
+    r = extract_main_text(html, base_url="https://example.com/x")
+    assert r.title == "決算発表"
+    assert "売上高は前年比10%増加しました。" in r.main_text
+
+    r2 = extract_main_text(html, encoding="euc-jp")
+    assert r2.main_text == r.main_text
+
+
 def test_extract_main_text_basic() -> None:
     html = """
     <html>
@@ -116,6 +184,69 @@ def test_extract_evidence_quotes_enforces_max_chars_and_position() -> None:
     assert out[1].position == "unknown"
 
 
+def test_sentence_offsets_japanese_and_english() -> None:
+    text = "新製品を発表した。売上は12.5%増えた！ Revenue rose. The U.S. grew.\n見出し"
+    starts = sentence_offsets(text)
+    sentences = [
+        text[a:b].strip()
+        for a, b in zip(starts, list(starts[1:]) + [len(text)])
+    ]
+    assert sentences == [
+        "新製品を発表した。",
+        "売上は12.5%増えた！",
+        "Revenue rose.",
+        "The U.S. grew.",
+        "見出し",
+    ]
+    assert sentence_offsets(text) is starts  # cached
+
+
+def test_sentence_offsets_cache_is_bounded_and_keeps_no_text() -> None:
+    import src.server as server
+
+    for i in range(3 * server._SENTENCE_CACHE_SIZE):
+        sentence_offsets(f"Sentence {i}. Another one.")
+
+    assert len(server._SENTENCE_CACHE) == server._SENTENCE_CACHE_SIZE
+    for key, offsets in server._SENTENCE_CACHE.items():
+        assert isinstance(key, bytes)
+        assert all(isinstance(o, int) for o in offsets)
+
+
+def test_extract_evidence_quotes_case_insensitive_offsets() -> None:
+    text = "İstanbul office opened. Revenue ROSE sharply."
+    out = extract_evidence_quotes(text, ["revenue rose"], max_chars=100)
+    start, end = map(int, out[0].position.removeprefix("chars ").split("-"))
+    assert text[start:end] == out[0].excerpt
+    assert "Revenue ROSE" in out[0].excerpt
+
+
+def test_extract_evidence_quotes_snaps_to_sentences() -> None:
+    text = (
+        "CESで新製品を発表した。売上高は前年比12.5%増加した。"
+        "次の四半期も好調が続く見込み。"
+    )
+    out = extract_evidence_quotes(text, ["12.5%増加", "該当なし"], max_chars=30)
+
+    hit = out[0]
+    assert hit.excerpt == "CESで新製品を発表した。売上高は前年比12.5%増加した。"
+    start, end = map(int, hit.position.removeprefix("chars ").split("-"))
+    assert text[start:end] == hit.excerpt
+
+    miss = out[1]
+    assert miss.position == "unknown"
+    assert miss.excerpt == "CESで新製品を発表した。売上高は前年比12.5%増加した。"
+
+
+def test_extract_evidence_quotes_long_sentence_window() -> None:
+    text = "x" * 300 + "target" + "y" * 300 + "。次の文。"
+    out = extract_evidence_quotes(text, ["target"], max_chars=100)
+    start, end = map(int, out[0].position.removeprefix("chars ").split("-"))
+    assert end - start == 100
+    assert "target" in out[0].excerpt
+    assert text[start:end] == out[0].excerpt
+
+
 def test_save_sources_and_report(tmp_path: Path) -> None:
     now = datetime.now(timezone.utc)
     records = [
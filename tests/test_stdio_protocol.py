@@ -27,3 +27,31 @@ def test_stdio_list_tools() -> None:
     assert payload["ok"] is True
     assert "tools" in payload["result"]
     assert "fetch_url" in payload["result"]["tools"]
+
+
+def test_stdio_invoke_writes_utf8_json() -> None:
+    env = os.environ.copy()
+    repo_root = Path(__file__).resolve().parents[1]
+    env["PYTHONPATH"] = str(repo_root)
+    env["APP_CONFIG"] = str(repo_root / "nonexistent.yaml")
+
+    req = {
+        "action": "invoke",
+        "tool": "extract_evidence_quotes",
+        "params": {"text": "売上高は10%増加した。", "claims": ["10%増加"]},
+    }
+    proc = subprocess.run(
+        [sys.executable, "-m", "src.main"],
+        input=(json.dumps(req) + "\n").encode("utf-8"),
+        capture_output=True,
+        env=env,
+        cwd=repo_root,
+        check=True,
+    )
+
+    line = proc.stdout.strip().splitlines()[-1]
+    # Non-ASCII is emitted as raw UTF-8, not \u escapes.
+    assert "増加".encode("utf-8") in line
+    payload = json.loads(line)
+    assert payload["ok"] is True
+    assert payload["result"][0]["claim"] == "10%増加"